@@ -6,13 +6,32 @@ for POS tagging evaluation.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import json
-import random
 from pathlib import Path
-from rich import print
+from rich.console import Console
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rows per record batch when streaming the parquet file
+BATCH_SIZE = 131072
+
+# Rich logging for verbose diagnostics only; regular output uses print
+console = Console()
+log = console.log
 
 def clean_text_for_length(text):
-    """Clean text field for length calculation, handling nulls."""
+    """Clean a single text field for length calculation, handling nulls.
+
+    The bulk length computation in extract_inscriptions_for_pos_testing runs
+    on Arrow compute kernels; this helper is kept for one-off checks on
+    individual values.
+    """
     if pd.isna(text) or text is None:
         return ""
     return str(text).strip()
@@ -21,7 +40,8 @@ def extract_inscriptions_for_pos_testing(
     input_parquet="LIST_v1-2.parquet",
     output_json="POS-LIST-test1.json",
     n_samples=20,
-    random_seed=42
+    random_seed=42,
+    verbose=False
 ):
     """
     Extract random sample of inscriptions from top decile by length.
@@ -36,20 +56,12 @@ def extract_inscriptions_for_pos_testing(
         Number of random samples to extract (default: 20)
     random_seed : int
         Random seed for reproducibility (default: 42)
+    verbose : bool
+        Log the type of every output field for debugging (default: False)
     """
     
-    print(f"Reading parquet file: {input_parquet}")
-    try:
-        df = pd.read_parquet(input_parquet)
-        print(f"Successfully loaded {len(df):,} inscriptions")
-    except FileNotFoundError:
-        print(f"Error: Could not find file {input_parquet}")
-        return
-    except Exception as e:
-        print(f"Error reading parquet file: {e}")
-        return
-    
-    # Verify required columns exist
+    # Only these columns are used downstream; projecting them at read time
+    # avoids decoding the rest of the (wide) parquet file
     required_cols = [
         'LIST-ID', 
         'inscription',
@@ -64,85 +76,140 @@ def extract_inscriptions_for_pos_testing(
         'urban_context_city'
     ]
     
-    missing_cols = [col for col in required_cols if col not in df.columns]
+    text_col = 'clean_text_interpretive_word'
+    
+    print(f"Reading parquet file: {input_parquet}")
+    try:
+        parquet_file = pq.ParquetFile(input_parquet)
+        print(f"Found {parquet_file.metadata.num_rows:,} inscriptions")
+    except FileNotFoundError:
+        print(f"Error: Could not find file {input_parquet}")
+        return
+    except Exception as e:
+        print(f"Error reading parquet file: {e}")
+        return
+    
+    # Verify required columns exist before projecting
+    available_cols = parquet_file.schema_arrow.names
+    missing_cols = [col for col in required_cols if col not in available_cols]
     if missing_cols:
         print(f"Warning: Missing columns in parquet file: {missing_cols}")
-        print("Available columns:", df.columns.tolist()[:10], "...")
+        print("Available columns:", available_cols[:10], "...")
+    projected_cols = [col for col in required_cols if col in available_cols]
     
-    # Calculate text lengths for filtering
+    # Pass 1: stream only the text column to calculate lengths for filtering.
+    # Nulls count as empty, matching clean_text_for_length.
     print("\nCalculating text lengths...")
-    df['text_length'] = df['clean_text_interpretive_word'].apply(
-        lambda x: len(clean_text_for_length(x))
-    )
+    # Filled in place as one contiguous int32 array, one batch at a time
+    lengths = np.empty(parquet_file.metadata.num_rows, dtype=np.int32)
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE, columns=[text_col]):
+        batch_lengths = pc.fill_null(
+            pc.utf8_length(pc.utf8_trim_whitespace(batch.column(text_col))), 0
+        ).cast(pa.int32())
+        lengths[offset:offset + batch.num_rows] = batch_lengths.to_numpy()
+        offset += batch.num_rows
     
     # Remove entries with zero length
-    df_with_text = df[df['text_length'] > 0].copy()
-    print(f"Inscriptions with text: {len(df_with_text):,}")
+    lengths_with_text = lengths[lengths > 0]
+    print(f"Inscriptions with text: {len(lengths_with_text):,}")
+    if len(lengths_with_text) == 0:
+        print("Error: No inscriptions with text found")
+        return
     
-    # Calculate the 90th percentile threshold
-    length_threshold = df_with_text['text_length'].quantile(0.9)
+    # Calculate the 90th percentile threshold directly on the int32 array;
+    # np.quantile selects the bracketing values with introselect (np.partition)
+    # rather than a full sort, so no explicit partition step is needed
+    length_threshold = np.quantile(lengths_with_text, 0.9)
     print(f"\n90th percentile length threshold: {length_threshold:.0f} characters")
     
-    # Filter for top decile
-    df_top_decile = df_with_text[df_with_text['text_length'] >= length_threshold].copy()
-    print(f"Inscriptions in top decile: {len(df_top_decile):,}")
-    
-    # Set random seed for reproducibility
-    random.seed(random_seed)
-    np.random.seed(random_seed)
+    # Local generator for reproducibility, without touching global random state
+    rng = np.random.default_rng(random_seed)
+    
+    # Pass 2: stream the projected columns and reservoir-sample the top decile
+    # (Algorithm R), so only n_samples rows are ever materialized
+    reservoir = []
+    seen = 0
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE, columns=projected_cols):
+        batch_lengths = lengths[offset:offset + batch.num_rows]
+        offset += batch.num_rows
+        for row_idx in np.flatnonzero(batch_lengths >= length_threshold):
+            slot = seen if seen < n_samples else rng.integers(0, seen + 1)
+            seen += 1
+            if slot >= n_samples:
+                continue
+            row = batch.slice(row_idx, 1).append_column(
+                'text_length', pa.array([batch_lengths[row_idx]])
+            )
+            if slot < len(reservoir):
+                reservoir[slot] = row
+            else:
+                reservoir.append(row)
+    print(f"Inscriptions in top decile: {seen:,}")
     
-    # Sample 20 random inscriptions
-    n_to_sample = min(n_samples, len(df_top_decile))
-    if n_to_sample < n_samples:
-        print(f"\nWarning: Only {n_to_sample} inscriptions available in top decile")
+    if len(reservoir) < n_samples:
+        print(f"\nWarning: Only {len(reservoir)} inscriptions available in top decile")
     
-    sampled_df = df_top_decile.sample(n=n_to_sample, random_state=random_seed)
+    sampled_df = pa.Table.from_batches(reservoir).to_pandas(types_mapper=pd.ArrowDtype)
     print(f"\nSampled {len(sampled_df)} inscriptions")
     
-    # Prepare output data
-    output_data = []
-    
-    for idx, row in sampled_df.iterrows():
-        inscription_data = {
-            'LIST-ID': row.get('LIST-ID'),
-            'inscription': row.get('inscription'),
-            'text_conservative': row.get('clean_text_conservative'),
-            'text_interpretive_word': row.get('clean_text_interpretive_word'),
-            'text_interpretive_sentence': row.get('clean_text_interpretive_sentence'),
-            'type_of_inscription_auto': row.get('type_of_inscription_auto'),
+    # Prepare output data, converting nulls to None once for the whole frame
+    # (dating years as nullable integers)
+    year_cols = {col: 'Int64' for col in ('not_before', 'not_after') if col in sampled_df.columns}
+    records = (
+        sampled_df.astype(year_cols)
+        .astype(object)
+        .where(lambda d: d.notna(), None)
+        .to_dict(orient='records')
+    )
+    output_data = [
+        {
+            'LIST-ID': r.get('LIST-ID'),
+            'inscription': r.get('inscription'),
+            'text_conservative': r.get('clean_text_conservative'),
+            'text_interpretive_word': r.get('clean_text_interpretive_word'),
+            'text_interpretive_sentence': r.get('clean_text_interpretive_sentence'),
+            'type_of_inscription_auto': r.get('type_of_inscription_auto'),
             'dating': {
-                'not_before': int(row['not_before']) if pd.notna(row.get('not_before')) else None,
-                'not_after': int(row['not_after']) if pd.notna(row.get('not_after')) else None
+                'not_before': r.get('not_before'),
+                'not_after': r.get('not_after')
             },
             'geography': {
-                'latitude': row.get('Latitude') if pd.notna(row.get('Latitude')) else None,
-                'longitude': row.get('Longitude') if pd.notna(row.get('Longitude')) else None,
-                'urban_context_city': row.get('urban_context_city') if pd.notna(row.get('urban_context_city')) else None
+                'latitude': r.get('Latitude'),
+                'longitude': r.get('Longitude'),
+                'urban_context_city': r.get('urban_context_city')
             },
-            'text_length': int(row['text_length'])
+            'text_length': r['text_length']
         }
-        output_data.append(inscription_data)
+        for r in records
+    ]
     
     # Sort by LIST-ID for consistent output
     output_data.sort(key=lambda x: x['LIST-ID'] if x['LIST-ID'] else '')
     
-    # print output with rich
     print("\nSampled inscriptions:")
     for item in output_data:
         print(f"  - LIST-ID: {item['LIST-ID']}, Length: {item['text_length']} characters")
-        # and print out type of each field
+        if not verbose:
+            continue
+        # and log the type of each field with rich
         for key, value in item.items():
             if isinstance(value, dict):
-                print(f"    {key}: {{")
+                log(f"    {key}: {{")
                 for subkey, subvalue in value.items():
-                    print(f"      {subkey}: {type(subvalue).__name__}")
-                print("    }")
+                    log(f"      {subkey}: {type(subvalue).__name__}")
+                log("    }")
             else:
-                print(f"    {key}: {type(value).__name__}")
+                log(f"    {key}: {type(value).__name__}")
     # Write to JSON file
     print(f"\nWriting output to: {output_json}")
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(output_json, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(output_data, f, ensure_ascii=False, indent=2)
     
     # Print summary statistics
     print("\n" + "="*50)
@@ -7,32 +7,29 @@ Shows inscription lines with matching characters highlighted
 
 import json
 import re
+import numpy as np
 from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.cell.text import InlineFont
 from openpyxl.cell.rich_text import TextBlock, CellRichText
 
-# Universal Dependencies v2 POS tags
-UD_POS_TAGS = [
-    "ADJ",   # adjective
-    "ADP",   # adposition (preposition/postposition)
-    "ADV",   # adverb
-    "AUX",   # auxiliary verb
-    "CCONJ", # coordinating conjunction
-    "DET",   # determiner
-    "INTJ",  # interjection
-    "NOUN",  # noun
-    "NUM",   # numeral
-    "PART",  # particle
-    "PRON",  # pronoun
-    "PROPN", # proper noun
-    "PUNCT", # punctuation
-    "SCONJ", # subordinating conjunction
-    "SYM",   # symbol
-    "VERB",  # verb
-    "X"      # other (foreign words, typos, abbreviations)
-]
+from ud_pos_tags import POS_LIST_FORMULA
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when numba is not installed"""
+        return lambda func: func
 
 # Instructions for the annotator (will go in column)
 INSTRUCTIONS = """Universal Dependencies v2 POS Tags:
@@ -62,20 +59,60 @@ def clean_for_matching(text):
     return cleaned.lower()
 
 
-def find_matching_line(word, inscription_lines):
+def prepare_lines(inscription_lines):
+    """
+    Lowercase each line once and precompute its byte buffer and letter mask
+    Returns two lists, with None for lines the compiled matcher can't handle
+    """
+    line_bufs = []
+    line_alpha = []
+    
+    for line in inscription_lines:
+        # Byte offsets only equal character offsets for ASCII text
+        if NUMBA_AVAILABLE and line.isascii():
+            buf = np.frombuffer(line.lower().encode('ascii'), dtype=np.uint8)
+            line_bufs.append(buf)
+            line_alpha.append((buf >= 97) & (buf <= 122))
+        else:
+            line_bufs.append(None)
+            line_alpha.append(None)
+    
+    return line_bufs, line_alpha
+
+
+def find_matching_line(word, inscription_lines, line_bufs=None, line_alpha=None):
     """
     Find which line contains the best matching substring for the word
-    Returns the line index and the line text
+    Returns the line index and the start and end positions of the match
+    (-1, -1 if no line matches)
+    
+    line_bufs and line_alpha come from prepare_lines; pass them when
+    matching many words against the same lines
     """
+    best_line_idx = 0
+    best_start = -1
+    best_end = -1
+    
     if not word or not inscription_lines:
-        return 0, inscription_lines[0] if inscription_lines else ""
+        return best_line_idx, best_start, best_end
+    
+    if line_bufs is None or line_alpha is None:
+        line_bufs, line_alpha = prepare_lines(inscription_lines)
+    
+    # Lowercase the word and pick the compiled matcher once for all lines
+    word_buf = None
+    if word.isascii():
+        word_buf = np.frombuffer(word.lower().encode('ascii'), dtype=np.uint8)
+        matcher = _select_matcher(word_buf)
     
-    best_line_idx = 0
     best_score = 0
     
     for idx, line in enumerate(inscription_lines):
         # Find the best matching substring in this line
-        start, end = find_matching_substring(line, word)
+        if word_buf is not None and line_bufs[idx] is not None:
+            start, end, _ = matcher(line_bufs[idx], line_alpha[idx], word_buf)
+        else:
+            start, end = _find_matching_substring_py(line, word)
         
         if start != -1:
             # Score based on how much of the word was matched
@@ -84,8 +121,14 @@ def find_matching_line(word, inscription_lines):
             if score > best_score:
                 best_score = score
                 best_line_idx = idx
+                best_start = start
+                best_end = end
+                
+                # A perfectly compact match cannot be beaten by a later line
+                if score == 1.0:
+                    break
     
-    return best_line_idx, inscription_lines[best_line_idx] if inscription_lines else ""
+    return best_line_idx, best_start, best_end
 
 
 def find_matching_substring(line_text, word):
@@ -93,13 +136,155 @@ def find_matching_substring(line_text, word):
     Find the substring in line_text that best matches the word
     Returns start and end positions of the match
     """
+    (line_buf,), (alpha_mask,) = prepare_lines([line_text])
+    
+    if line_buf is not None and word.isascii():
+        word_buf = np.frombuffer(word.lower().encode('ascii'), dtype=np.uint8)
+        start, end, _ = _select_matcher(word_buf)(line_buf, alpha_mask, word_buf)
+        return start, end
+    
+    return _find_matching_substring_py(line_text, word)
+
+
+def _select_matcher(word_buf):
+    """
+    Pick the compiled matcher for a lowercased ASCII word
+    Words made only of letters can use the linear-time _match_letters
+    """
+    if ((word_buf >= 97) & (word_buf <= 122)).all():
+        return _match_letters
+    return _match
+
+
+@njit(cache=True)
+def _match_letters(line_buf, alpha_mask, word_buf):
+    """
+    Linear-time equivalent of _match for words made only of letters
+    
+    Non-letters are skipped and any other letter stops a match, so a match is
+    an occurrence of the word in the line's letters with the non-letters
+    removed. One left-to-right KMP scan over the letters finds every
+    occurrence, in the same order _match tries its start positions.
+    Returns start and end positions of the match and its score
+    """
+    line_len = line_buf.shape[0]
+    word_len = word_buf.shape[0]
+    best_start = -1
+    best_end = -1
+    best_score = 0.0
+    
+    if word_len == 0:
+        return best_start, best_end, best_score
+    
+    # KMP failure table for the word
+    failure = np.zeros(word_len, dtype=np.int64)
+    k = 0
+    for q in range(1, word_len):
+        while k > 0 and word_buf[q] != word_buf[k]:
+            k = failure[k - 1]
+        if word_buf[q] == word_buf[k]:
+            k += 1
+        failure[q] = k
+    
+    # Positions of the letters seen so far, to map matches back to the line
+    letter_pos = np.empty(line_len, dtype=np.int64)
+    letter_count = 0
+    word_idx = 0
+    
+    for end_pos in range(line_len):
+        if not alpha_mask[end_pos]:
+            continue
+        
+        char = line_buf[end_pos]
+        letter_pos[letter_count] = end_pos
+        letter_count += 1
+        
+        while word_idx > 0 and char != word_buf[word_idx]:
+            word_idx = failure[word_idx - 1]
+        if char == word_buf[word_idx]:
+            word_idx += 1
+        
+        if word_idx == word_len:
+            start_pos = letter_pos[letter_count - word_len]
+            score = word_len / (end_pos + 1 - start_pos)
+            if score > best_score:
+                best_score = score
+                best_start = start_pos
+                best_end = end_pos + 1
+                
+                # Later matches can only tie a perfectly compact one
+                if score == 1.0:
+                    break
+            word_idx = failure[word_idx - 1]
+    
+    return best_start, best_end, best_score
+
+
+@njit(cache=True)
+def _match(line_buf, alpha_mask, word_buf):
+    """
+    Compiled version of _find_matching_substring_py over lowercased ASCII buffers
+    alpha_mask marks the letters (a-z) in line_buf
+    Returns start and end positions of the match and its score
+    """
+    line_len = line_buf.shape[0]
+    word_len = word_buf.shape[0]
+    best_start = -1
+    best_end = -1
+    best_score = 0.0
+    
+    if word_len == 0:
+        return best_start, best_end, best_score
+    
+    # Only positions holding the word's first character can give the best
+    # match: skipping a leading non-letter only makes the match less compact
+    starts = np.flatnonzero(line_buf == word_buf[0])
+    
+    for k in range(starts.size):
+        start_pos = starts[k]
+        word_idx = 0
+        end_pos = start_pos
+        
+        while end_pos < line_len and word_idx < word_len:
+            char = line_buf[end_pos]
+            
+            if char == word_buf[word_idx]:
+                word_idx += 1
+            elif alpha_mask[end_pos]:
+                # This is a letter that doesn't match - stop this attempt
+                break
+            
+            end_pos += 1
+        
+        if word_idx == word_len:
+            score = word_idx / max(1, (end_pos - start_pos))
+            if score > best_score:
+                best_score = score
+                best_start = start_pos
+                best_end = end_pos
+    
+    return best_start, best_end, best_score
+
+
+def _find_matching_substring_py(line_text, word):
+    """
+    Pure-Python matcher, used for non-ASCII text or when numba is unavailable
+    Returns start and end positions of the match
+    """
     word_lower = word.lower()
     best_start = -1
     best_end = -1
     best_score = 0
     
-    # Try to find the word's characters in sequence
+    if not word_lower:
+        return best_start, best_end
+    
+    # Try to find the word's characters in sequence, starting only where the
+    # first character matches (see _match)
     for start_pos in range(len(line_text)):
+        if line_text[start_pos].lower() != word_lower[0]:
+            continue
+        
         word_idx = 0
         end_pos = start_pos
         
@@ -129,18 +314,12 @@ def find_matching_substring(line_text, word):
     return best_start, best_end
 
 
-def create_highlighted_text(line_text, word):
+def create_highlighted_text(line_text, start, end):
     """
-    Create rich text with matching substring bolded
+    Create rich text with the substring between start and end bolded
     Returns a CellRichText object for openpyxl
     """
-    if not word or not line_text:
-        return line_text
-    
-    # Find the matching substring
-    start, end = find_matching_substring(line_text, word)
-    
-    if start == -1:
+    if start == -1 or not line_text:
         # No match found, return plain text
         return line_text
     
@@ -169,15 +348,16 @@ def create_validation_spreadsheet(json_file, output_file):
     """Create XLSX spreadsheet with line-based highlighting for POS tagging"""
     
     # Load data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Create workbook
-    wb = Workbook()
+    if orjson is not None:
+        with open(json_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
-    # Remove default sheet
-    if 'Sheet' in wb.sheetnames:
-        wb.remove(wb['Sheet'])
+    # Create workbook in write-only mode so rows are serialized as they are
+    # appended (write-only workbooks start without a default sheet)
+    wb = Workbook(write_only=True)
     
     # Process first 20 inscriptions
     for idx, inscription_data in enumerate(data[:20]):
@@ -192,11 +372,27 @@ def create_validation_spreadsheet(json_file, output_file):
         
         # Split inscription into lines
         inscription_lines = inscription_text.split('/')
+        line_bufs, line_alpha = prepare_lines(inscription_lines)
         
         # Create sheet named by LIST-ID
         sheet_name = str(list_id)[:31]  # Excel sheet name limit
         ws = wb.create_sheet(title=sheet_name)
         
+        # Write-only sheets serialize column widths and panes with the first
+        # row, so set them before appending anything
+        ws.column_dimensions['A'].width = 60  # Inscription_Line
+        ws.column_dimensions['B'].width = 20  # Interpretive_Word
+        ws.column_dimensions['C'].width = 12  # POS
+        ws.column_dimensions['D'].width = 30  # Notes
+        ws.column_dimensions['E'].width = 40  # Instructions
+        ws.column_dimensions['F'].width = 50  # Full_Inscription
+        ws.column_dimensions['G'].width = 50  # Full_Interpretive
+        ws.column_dimensions['H'].width = 20  # Type_of_Inscription
+        ws.column_dimensions['I'].width = 12  # LIST_ID
+        
+        # Freeze the header row
+        ws.freeze_panes = 'A2'
+        
         # Add headers
         headers = [
             'Inscription_Line', 'Interpretive_Word', 'POS', 'Notes',
@@ -211,7 +407,7 @@ def create_validation_spreadsheet(json_file, output_file):
         # Create POS tag validation
         dv = DataValidation(
             type="list",
-            formula1=f'"{",".join(UD_POS_TAGS)}"',
+            formula1=POS_LIST_FORMULA,
             allow_blank=True
         )
         dv.error = 'Please select a valid UD POS tag'
@@ -220,52 +416,47 @@ def create_validation_spreadsheet(json_file, output_file):
         # Track which line we're currently on for sequential matching
         current_line_idx = 0
         
+        # Metadata and instructions only go in the first data row. Write-only
+        # sheets can't revisit row 2 after the loop, so they are appended with
+        # the first word and every later row carries just the four word columns
+        metadata = [
+            INSTRUCTIONS,       # Instructions
+            inscription_text,   # Full inscription
+            interpretive_text,  # Full interpretive
+            inscription_type,   # Type
+            str(list_id)        # LIST_ID
+        ]
+        
         # Add data rows
-        for row_idx, word in enumerate(interpretive_words, start=2):
+        for word in interpretive_words:
             # Find the line containing this word's characters
-            line_idx, line_text = find_matching_line(word, inscription_lines)
+            line_idx, start, end = find_matching_line(
+                word, inscription_lines, line_bufs, line_alpha
+            )
+            line_text = inscription_lines[line_idx]
             
             # Update current line index if we've moved forward
             if line_idx >= current_line_idx:
                 current_line_idx = line_idx
             
             # Create highlighted version of the line
-            highlighted_line = create_highlighted_text(line_text, word)
+            highlighted_line = create_highlighted_text(line_text, start, end)
             
             row_data = [
                 highlighted_line,   # Inscription_Line (with highlighting)
                 word,              # Interpretive_Word
                 '',                # POS (empty for annotation)
-                '',                # Notes (empty for annotation)
-                INSTRUCTIONS if row_idx == 2 else '',  # Instructions (only first row)
-                inscription_text if row_idx == 2 else '',  # Full inscription (only first row)
-                interpretive_text if row_idx == 2 else '',  # Full interpretive (only first row)
-                inscription_type if row_idx == 2 else '',  # Type (only first row)
-                str(list_id) if row_idx == 2 else ''  # LIST_ID (only first row)
+                ''                 # Notes (empty for annotation)
             ]
             
             # Add the row
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            
-            # Add validation to POS column (column C)
-            dv.add(f'C{row_idx}')
+            ws.append(row_data + metadata)
+            metadata = []
         
-        ws.add_data_validation(dv)
-        
-        # Adjust column widths for readability
-        ws.column_dimensions['A'].width = 60  # Inscription_Line
-        ws.column_dimensions['B'].width = 20  # Interpretive_Word
-        ws.column_dimensions['C'].width = 12  # POS
-        ws.column_dimensions['D'].width = 30  # Notes
-        ws.column_dimensions['E'].width = 40  # Instructions
-        ws.column_dimensions['F'].width = 50  # Full_Inscription
-        ws.column_dimensions['G'].width = 50  # Full_Interpretive
-        ws.column_dimensions['H'].width = 20  # Type_of_Inscription
-        ws.column_dimensions['I'].width = 12  # LIST_ID
-        
-        # Freeze the header row
-        ws.freeze_panes = 'A2'
+        # Add validation to POS column (column C) as a single range
+        if interpretive_words:
+            dv.add(f'C2:C{len(interpretive_words) + 1}')
+        ws.data_validations.append(dv)
         
         print(f"Processed inscription {list_id}: {len(interpretive_words)} tokens")
     
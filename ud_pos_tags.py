@@ -0,0 +1,36 @@
+"""
+Universal Dependencies v2 POS tagset shared by the Stage 1 annotation scripts
+"""
+
+# Universal Dependencies v2 POS tags
+UD_POS_TAGS = [
+    "ADJ",   # adjective
+    "ADP",   # adposition (preposition/postposition)
+    "ADV",   # adverb
+    "AUX",   # auxiliary verb
+    "CCONJ", # coordinating conjunction
+    "DET",   # determiner
+    "INTJ",  # interjection
+    "NOUN",  # noun
+    "NUM",   # numeral
+    "PART",  # particle
+    "PRON",  # pronoun
+    "PROPN", # proper noun
+    "PUNCT", # punctuation
+    "SCONJ", # subordinating conjunction
+    "SYM",   # symbol
+    "VERB",  # verb
+    "X"      # other (foreign words, typos, abbreviations)
+]
+
+# Short descriptions for the tag reference block
+TAG_DESCRIPTIONS = {
+    "ADJ": "adjective", "ADP": "adposition", "ADV": "adverb", "AUX": "auxiliary",
+    "CCONJ": "coordinating conjunction", "DET": "determiner", "INTJ": "interjection",
+    "NOUN": "noun", "NUM": "numeral", "PART": "particle", "PRON": "pronoun",
+    "PROPN": "proper noun", "PUNCT": "punctuation", "SCONJ": "subordinating conjunction",
+    "SYM": "symbol", "VERB": "verb", "X": "other"
+}
+
+# Dropdown list formula for the POS column, shared by every sheet
+POS_LIST_FORMULA = '"' + ",".join(UD_POS_TAGS) + '"'